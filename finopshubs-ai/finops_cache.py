@@ -0,0 +1,271 @@
+# finops_cache.py
+# ------------------------------------
+# Answer cache for the FinOps expert
+# Paraphrased questions are matched by embedding similarity
+# ------------------------------------
+
+import os
+import json
+import time
+import threading
+import concurrent.futures
+from collections import OrderedDict
+
+import numpy as np
+
+# orjson is optional - it serializes the cache snapshots and keys several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_dumps(obj):
+    """Serialize to compact UTF-8 JSON bytes with sorted keys - identical output with or without orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".finops_cache")
+
+def config_variant(config, defaults):
+    """Describe the options in config that differ from defaults - "" when it matches them all
+
+    Answers produced with different answer-affecting options are cached (and coalesced) under different variants."""
+    return ",".join(
+        f"{name}={config[name]!r}" for name, default in sorted(defaults.items())
+        if name in config and config[name] != default
+    )
+
+class SemanticAnswerCache:
+    """LRU answer cache that matches questions by embedding cosine similarity, persisted as JSON + .npy
+
+    `embed` maps normalized question text to an embedding vector; without it only exact repeats match.
+    The snapshot is rewritten after every put, so answers survive a killed process."""
+
+    # Evicted entries leave zeroed rows behind; the matrix is compacted once this many have piled up
+    REBUILD_AFTER_EVICTIONS = 64
+
+    def __init__(self, directory=CACHE_DIR, name="semantic_answers", maxsize=512, threshold=0.92, ttl=24 * 60 * 60, embed=None):
+        self.json_path = os.path.join(directory, f"{name}.json")
+        self.npy_path = os.path.join(directory, f"{name}.npy")
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        self.embed = embed
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # _key() -> {"question", "variant", "answer", "ts", "embedding"}, oldest first
+        self._matrix = None  # Contiguous float32 buffer of L2-normalized embeddings, grown by doubling
+        self._row_keys = []  # Entry key for each used row of _matrix, None for evicted rows
+        self._rows = {}  # Entry key -> row of _matrix
+        self._dead_rows = 0
+        self._inflight = {}  # _key() -> Future of the answer currently being computed
+        self._dirty = False
+        self.load()
+
+    @staticmethod
+    def _normalize(question):
+        return " ".join(question.lower().split())
+
+    @classmethod
+    def _key(cls, question, variant=""):
+        normalized = cls._normalize(question)
+        return f"{variant}\x1f{normalized}" if variant else normalized
+
+    def _embed(self, question):
+        """Return the L2-normalized embedding for a question, or None when no embedding backend is available"""
+        if self.embed is None:
+            return None
+
+        try:
+            vector = np.asarray(self.embed(self._normalize(question)), dtype=np.float32)
+        except Exception as e:
+            print(f"⚠️ Could not embed question for the semantic cache: {str(e)}")
+            return None
+        return vector / np.linalg.norm(vector)
+
+    def _is_fresh(self, entry):
+        return time.time() - entry["ts"] < self.ttl
+
+    def _rebuild_matrix(self):
+        """Pack the embeddings of the current entries into a fresh matrix, dropping evicted rows"""
+        self._row_keys = [key for key, entry in self._entries.items() if entry["embedding"] is not None]
+        self._rows = {key: row for row, key in enumerate(self._row_keys)}
+        self._matrix = (
+            np.ascontiguousarray(np.vstack([self._entries[key]["embedding"] for key in self._row_keys]), dtype=np.float32)
+            if self._row_keys else None
+        )
+        self._dead_rows = 0
+
+    def _append_row(self, key, embedding):
+        row = len(self._row_keys)
+        if self._matrix is None:
+            self._matrix = np.zeros((16, embedding.shape[0]), dtype=np.float32)
+        elif row == len(self._matrix):
+            grown = np.zeros((2 * row, self._matrix.shape[1]), dtype=np.float32)
+            grown[:row] = self._matrix
+            self._matrix = grown
+        self._matrix[row] = embedding
+        self._row_keys.append(key)
+        self._rows[key] = row
+
+    def _drop_row(self, key):
+        # A zeroed row has similarity 0 with every query, so it can never match
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._matrix[row] = 0
+            self._row_keys[row] = None
+            self._dead_rows += 1
+
+    def lookup(self, question, variant=""):
+        """Return the cached answer for the question (or a close paraphrase) under the same variant, or None"""
+        key = self._key(question, variant)
+        try:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and self._is_fresh(entry):
+                    self._entries.move_to_end(key)
+                    return entry["answer"]
+
+            # The embedding may be a network call, so it is made without holding the lock
+            question_embedding = self._embed(question)
+            if question_embedding is None:
+                return None
+
+            with self._lock:
+                if not self._rows:
+                    return None
+
+                # Cosine similarity against every cached question in one matrix-vector product,
+                # then the closest match above the threshold that was answered under the same variant
+                similarities = self._matrix[:len(self._row_keys)] @ question_embedding
+                candidates = np.flatnonzero(similarities >= self.threshold)
+                for row in candidates[np.argsort(similarities[candidates])[::-1]]:
+                    row_key = self._row_keys[row]
+                    if row_key is None:
+                        continue
+                    entry = self._entries[row_key]
+                    if entry["variant"] == variant and self._is_fresh(entry):
+                        self._entries.move_to_end(row_key)
+                        print(f"♻️ Matched cached question (similarity {similarities[row]:.2f}): {entry['question']}")
+                        return entry["answer"]
+        except Exception as e:
+            print(f"⚠️ Semantic cache lookup failed: {str(e)}")
+        return None
+
+    def put(self, question, answer, variant=""):
+        """Store the answer for the question under a variant, evicting the least recently used entries beyond maxsize"""
+        key = self._key(question, variant)
+        try:
+            embedding = self._embed(question)
+            with self._lock:
+                self._drop_row(key)
+                self._entries[key] = {
+                    "question": question,
+                    "variant": variant,
+                    "answer": answer,
+                    "ts": time.time(),
+                    "embedding": embedding
+                }
+                self._entries.move_to_end(key)
+                if embedding is not None:
+                    self._append_row(key, embedding)
+                while len(self._entries) > self.maxsize:
+                    evicted_key, _ = self._entries.popitem(last=False)
+                    self._drop_row(evicted_key)
+                if self._dead_rows >= self.REBUILD_AFTER_EVICTIONS:
+                    self._rebuild_matrix()
+                self._dirty = True
+        except Exception as e:
+            print(f"⚠️ Could not store answer in semantic cache: {str(e)}")
+        self.save()
+
+    def coalesce(self, question, compute, variant=""):
+        """Return compute(), or wait for the result of a call already computing the same question and variant"""
+        key = self._key(question, variant)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = concurrent.futures.Future()
+
+        if not owner:
+            print(f"⏳ Waiting for the answer already being prepared for: {question}")
+            return future.result()
+
+        try:
+            result = compute()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def load(self):
+        """Load the snapshot written by save(), dropping expired entries"""
+        if not os.path.exists(self.json_path):
+            return
+
+        try:
+            with open(self.json_path, "rb") as f:
+                rows = json_loads(f.read())
+            # Memory-mapped, so only the rows of entries that are loaded get read from disk.
+            # Rows are stored as float16 and widened back to float32 for the similarity matrix
+            embeddings = np.load(self.npy_path, mmap_mode="r") if os.path.exists(self.npy_path) else None
+
+            with self._lock:
+                for row in rows:
+                    embedding_row = row.get("embedding_row")
+                    entry = {
+                        "question": row["question"],
+                        "variant": row.get("variant", ""),
+                        "answer": row["answer"],
+                        "ts": row["ts"],
+                        "embedding": np.array(embeddings[embedding_row], dtype=np.float32) if embeddings is not None and embedding_row is not None else None
+                    }
+                    if self._is_fresh(entry):
+                        self._entries[self._key(entry["question"], entry["variant"])] = entry
+                self._rebuild_matrix()
+        except Exception as e:
+            print(f"⚠️ Could not load semantic cache from {self.json_path}: {str(e)}")
+
+    def save(self):
+        """Write the cache to disk as JSON metadata plus one float16 .npy embedding matrix"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            try:
+                os.makedirs(os.path.dirname(self.json_path), exist_ok=True)
+                rows = []
+                embeddings = []
+                for entry in self._entries.values():
+                    embedding_row = None
+                    if entry["embedding"] is not None:
+                        embedding_row = len(embeddings)
+                        embeddings.append(entry["embedding"])
+                    rows.append({
+                        "question": entry["question"],
+                        "variant": entry["variant"],
+                        "answer": entry["answer"],
+                        "ts": entry["ts"],
+                        "embedding_row": embedding_row
+                    })
+
+                # Write to temporary files first so an interrupted save can't leave a half-written snapshot
+                with open(self.json_path + ".tmp", "wb") as f:
+                    f.write(json_dumps(rows))
+                if embeddings:
+                    # float16 halves the snapshot size; the precision loss is far below the match threshold
+                    with open(self.npy_path + ".tmp", "wb") as f:
+                        np.save(f, np.vstack(embeddings).astype(np.float16))
+                    os.replace(self.npy_path + ".tmp", self.npy_path)
+                os.replace(self.json_path + ".tmp", self.json_path)
+                self._dirty = False
+            except Exception as e:
+                print(f"⚠️ Could not save semantic cache to {self.json_path}: {str(e)}")
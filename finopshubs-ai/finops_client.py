@@ -0,0 +1,88 @@
+# finops_client.py
+# ------------------------------------
+# Azure clients shared by the FinOps scripts
+# One credential, one pooled HTTP session and one project client per connection string for the whole process
+# ------------------------------------
+
+import os
+import time
+import atexit
+import functools
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from azure.core.pipeline.transport import RequestsTransport
+
+# Shared HTTP session so the project and DeepSeek clients keep TLS connections warm
+# and can run more than the default handful of requests in parallel
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+atexit.register(http_session.close)
+
+def create_pooled_transport():
+    """Create an Azure SDK transport backed by the shared HTTP session"""
+    # session_owner=False keeps the session open when an individual client is closed
+    return RequestsTransport(session=http_session, session_owner=False)
+
+class CachedTokenCredential:
+    """Wraps a credential and reuses each access token until shortly before it expires
+
+    Some credentials (the Azure CLI one in particular) fetch a new token,
+    and spawn a subprocess, on every get_token call."""
+
+    REFRESH_MARGIN = 5 * 60  # Seconds before expiry at which a token is fetched again
+
+    def __init__(self, credential):
+        self._credential = credential
+        self._tokens = {}  # (scopes, tenant_id) -> AccessToken
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes, **kwargs):
+        # Claims challenges (continuous access evaluation) always need a fresh token
+        if kwargs.get("claims"):
+            return self._credential.get_token(*scopes, **kwargs)
+
+        key = (scopes, kwargs.get("tenant_id"))
+        token = self._tokens.get(key)
+        if token is None or time.time() >= token.expires_on - self.REFRESH_MARGIN:
+            with self._lock:
+                token = self._tokens.get(key)
+                if token is None or time.time() >= token.expires_on - self.REFRESH_MARGIN:
+                    token = self._tokens[key] = self._credential.get_token(*scopes, **kwargs)
+        return token
+
+    def close(self):
+        self._credential.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def create_credential():
+    """Create a credential with only the sign-in methods these scripts use
+
+    AZURE_ENV=prod uses the managed identity (AZURE_CLIENT_ID selects a user-assigned one);
+    otherwise a service principal from the environment, then the Azure CLI login."""
+    # Imported on first use - azure.identity is slow to import and not needed by callers that only want the transport
+    from azure.identity import AzureCliCredential, ChainedTokenCredential, EnvironmentCredential, ManagedIdentityCredential
+    if os.getenv("AZURE_ENV") == "prod":
+        return ManagedIdentityCredential(client_id=os.getenv("AZURE_CLIENT_ID"))
+    return ChainedTokenCredential(EnvironmentCredential(), AzureCliCredential())
+
+@functools.lru_cache(maxsize=1)
+def get_credential():
+    """Return the process-wide credential (with token caching), so it is only set up once"""
+    return CachedTokenCredential(create_credential())
+
+@functools.lru_cache(maxsize=None)
+def get_project_client(conn_string):
+    """Return the AI Project client for a connection string, creating it on first use"""
+    from azure.ai.projects import AIProjectClient
+    return AIProjectClient.from_connection_string(
+        credential=get_credential(),
+        conn_str=conn_string,
+        transport=create_pooled_transport()
+    )
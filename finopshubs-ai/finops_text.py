@@ -0,0 +1,163 @@
+# finops_text.py
+# ------------------------------------
+# Text helpers for the FinOps expert
+# URL normalization and labels, evaluation parsing, answer similarity and batch answer splitting - no Azure SDKs needed
+# ------------------------------------
+
+import re
+import hashlib
+import heapq
+
+# Patterns used to check what the enhanced answer already contains in a single pass
+URL_RE = re.compile(r'https?://[^\s)\]]+')
+
+BING_SEARCH_URL_RE = re.compile(r'www\.bing\.com/search')
+URL_SCHEME_RE = re.compile(r'^https?://')
+
+def normalize_url(url, bing_search_default=None):
+    """Return a displayable https URL, replacing Bing search links with a default when one is given"""
+    if bing_search_default and BING_SEARCH_URL_RE.search(url):
+        return bing_search_default
+    if URL_SCHEME_RE.match(url):
+        return url
+    return "https://" + url.lstrip('/')
+
+# Punctuation that ends a sentence or closes an autolink rather than belonging to the URL
+URL_TRAILING_PUNCTUATION = '.,;:!?>\'"'
+
+def url_match_key(url):
+    """Normalize a URL for checking whether an answer already cites it
+
+    Trailing punctuation and slashes are dropped, scheme-less URLs get https:// and case is ignored."""
+    return normalize_url(url.rstrip(URL_TRAILING_PUNCTUATION)).rstrip('/').lower()
+
+# Reference link labels, checked in order against each URL (anything else is labelled "Reference")
+REFERENCE_URL_LABELS = (
+    ("github.com/microsoft/finops-toolkit", "FinOps Toolkit GitHub Resource"),
+    ("learn.microsoft.com", "Microsoft Documentation"),
+    ("docs.microsoft.com", "Microsoft Documentation")
+)
+
+# Evaluation response parsing - section names map lowercased header -> canonical name.
+# A header matches when the canonical name appears anywhere in the line, or the line starts with it in any case
+EVALUATION_SECTIONS = {
+    "overall score": "Overall Score",
+    "strengths": "Strengths",
+    "weaknesses": "Weaknesses",
+    "improvement suggestions": "Improvement Suggestions",
+    "evaluation summary": "Evaluation Summary"
+}
+EVALUATION_SECTION_RE = re.compile(
+    r'^(?i:' + '|'.join(map(re.escape, EVALUATION_SECTIONS)) + ')|' + '|'.join(map(re.escape, EVALUATION_SECTIONS.values()))
+)
+SCORE_RE = re.compile(r'\b(?:10|[1-9])\b')
+WORD_RE = re.compile(r'[a-z]+')
+BULLET_CHARS = frozenset('-•*')
+NUMBERED_BULLET_RE = re.compile(r'\d+\.')
+BULLET_STRIP_CHARS = '- •*0123456789. '
+
+# Terms used to estimate a score when the evaluation doesn't state one
+POSITIVE_TERMS = frozenset({'excellent', 'good', 'thorough', 'comprehensive', 'accurate', 'clear', 'improved', 'better'})
+NEGATIVE_TERMS = frozenset({'poor', 'inadequate', 'missing', 'error', 'incorrect', 'unclear', 'lacks', 'issue'})
+
+def parse_evaluation(evaluation_text):
+    """Parse an evaluator response into its score, strengths, weaknesses, suggestions and summary
+
+    When the response states no score, one is estimated from its positive and negative terms."""
+    overall_score = None
+    strengths = []
+    weaknesses = []
+    improvement_suggestions = []
+    summary_lines = []
+
+    # Single pass: detect section headers and route each line straight into its result list
+    current_section = None
+    current_bucket = None
+    for line in evaluation_text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        # Check if this line is a section header
+        header_match = EVALUATION_SECTION_RE.search(line)
+        if header_match:
+            current_section = EVALUATION_SECTIONS[header_match.group(0).lower()]
+            current_bucket = (strengths if current_section == "Strengths"
+                              else weaknesses if current_section == "Weaknesses"
+                              else improvement_suggestions if current_section == "Improvement Suggestions"
+                              else None)
+
+        if not current_section or line.startswith(current_section):
+            continue
+
+        if current_bucket is not None:
+            # List items typically start with "- " or "1. "
+            if line[:1] in BULLET_CHARS or NUMBERED_BULLET_RE.match(line):
+                current_bucket.append(line.lstrip(BULLET_STRIP_CHARS))
+        elif current_section == "Overall Score":
+            # Take the first number between 1-10
+            if overall_score is None:
+                score_match = SCORE_RE.search(line)
+                if score_match:
+                    overall_score = int(score_match.group(0))
+        else:
+            summary_lines.append(line)
+
+    # If no overall score was found, estimate one based on the evaluation
+    if overall_score is None:
+        # Count positive vs negative terms as a fallback, tokenizing the text once
+        words = set(WORD_RE.findall(evaluation_text.lower()))
+        positive_count = len(words & POSITIVE_TERMS)
+        negative_count = len(words & NEGATIVE_TERMS)
+
+        # Ensure a minimum score of 2 unless it's completely negative
+        if positive_count > negative_count * 2:
+            overall_score = min(8, 4 + positive_count - negative_count)  # Mostly positive
+        elif positive_count > negative_count:
+            overall_score = min(6, 3 + positive_count - negative_count)  # More positive than negative
+        elif negative_count > positive_count * 2:
+            overall_score = max(2, 4 - (negative_count - positive_count))  # Mostly negative
+        else:
+            overall_score = max(2, 5 - (negative_count - positive_count))  # Mixed
+
+    return {
+        "overall_score": overall_score,
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "improvement_suggestions": improvement_suggestions,
+        "evaluation_summary": ' '.join(summary_lines)
+    }
+
+def answer_similarity(a, b, shingle_size=4, signature_size=128):
+    """Estimate the Jaccard similarity of two texts from bottom-k MinHash signatures of their word 4-gram shingles
+
+    The k smallest hashes of the union of both signatures are a sample of the union of the shingle sets,
+    and the fraction of them present in both signatures estimates the Jaccard similarity (exact when
+    either text has at most k shingles)."""
+    def signature(text):
+        words = text.split()
+        shingles = {" ".join(words[i:i + shingle_size]) for i in range(max(1, len(words) - shingle_size + 1))}
+        hashes = (int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big") for shingle in shingles)
+        return set(heapq.nsmallest(signature_size, hashes))
+
+    signature_a, signature_b = signature(a), signature(b)
+    union_sample = heapq.nsmallest(signature_size, signature_a | signature_b)
+    return sum(1 for h in union_sample if h in signature_a and h in signature_b) / len(union_sample)
+
+# Batched answers come back under numbered headings
+BATCH_ANSWER_HEADING_RE = re.compile(r'^###\s*Q(\d+)\s*$', re.MULTILINE)
+
+def split_batch_answer(answer, citations):
+    """Split a batched answer into {question number: (answer text, citations)}
+
+    A citation goes with an answer when its URL or one of its annotation markers appears in that answer's text"""
+    # re.split with a capture group yields [preamble, number, body, number, body, ...]
+    parts = BATCH_ANSWER_HEADING_RE.split(answer)
+    sections = {}
+    for number, body in zip(parts[1::2], parts[2::2]):
+        body = body.strip()
+        sections[int(number)] = (body, [
+            citation for citation in citations
+            if citation["url"] in body or any(marker in body for marker in citation.get("markers", ()))
+        ])
+    return sections
@@ -2,26 +2,53 @@
 # simplified_finops_with_bing.py - A simpler version with improved error handling
 
 import os
+import re
 import time
 import sys
+import functools
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
-from azure.ai.projects.models import MessageRole, BingGroundingTool
+from azure.ai.projects.models import MessageRole, BingGroundingTool, MessageDeltaChunk, ThreadMessage, ThreadRun, AgentStreamEvent
+from finops_client import get_credential, get_project_client
+
+# Number of distinct Bing searches listed under an answer
+MAX_SEARCH_URLS = 10
+
+# Static answer sections used when the run steps have no matching search URLs (or can't be read)
+GITHUB_FALLBACK_SECTION = (
+    "\n\n## Microsoft FinOps Toolkit GitHub Resources\n"
+    "For implementation examples, templates, and scripts, explore the [Microsoft FinOps Toolkit repository](https://github.com/microsoft/finops-toolkit).\n"
+)
+MSLEARN_FALLBACK_SECTION = (
+    "\n\n## Microsoft Learn Documentation\n"
+    "For official guidance, refer to [Microsoft's FinOps documentation](https://learn.microsoft.com/en-us/azure/cost-management-billing/finops/).\n"
+)
+KEY_RESOURCES_SECTION = (
+    "\n\n## Key Resources\n"
+    "1. [Microsoft FinOps Toolkit on GitHub](https://github.com/microsoft/finops-toolkit)\n"
+    "2. [Microsoft FinOps Documentation](https://learn.microsoft.com/en-us/azure/cost-management-billing/finops/)\n"
+    "3. [Azure Cost Management Documentation](https://learn.microsoft.com/en-us/azure/cost-management-billing/costs/)\n"
+)
+
+# Used to turn a question into a safe file name when saving a response
+UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\s-]')
+FILENAME_SEPARATORS_RE = re.compile(r'[-\s]+')
 
 # Find and load .env file
+@functools.lru_cache(maxsize=1)
 def find_dotenv():
-    """Find .env file by searching up the directory tree"""
+    """Find .env file by searching up the directory tree (result is cached)"""
     current_path = Path().absolute()
     
     # Try current directory and up to 3 levels up
-    for _ in range(4):
-        env_path = current_path / '.env'
+    for directory in (current_path, *current_path.parents[:3]):
+        env_path = directory / '.env'
         if env_path.exists():
             print(f"Found .env file at: {env_path}")
             return env_path
-        current_path = current_path.parent
     
     # Default to current directory .env if not found
     print("Could not find .env file, defaulting to current directory")
@@ -31,9 +58,13 @@ def find_dotenv():
 dotenv_path = find_dotenv()
 load_dotenv(dotenv_path)
 
-# Helper for getting environment variables with fallbacks
+# Set FINOPS_DEBUG=1 (in the environment or .env) to print the per-step details of each run
+DEBUG = os.getenv("FINOPS_DEBUG") == "1"
+
+# Helper for getting environment variables with fallbacks - the environment is fixed once .env is loaded
+@functools.lru_cache(maxsize=None)
 def get_env_var(name, fallback_names=None, default=None):
-    """Get environment variable with fallbacks and defaults"""
+    """Get environment variable with fallbacks and defaults (pass fallback_names as a tuple)"""
     value = os.getenv(name)
     
     # Try fallbacks if provided and main value is not set
@@ -56,9 +87,9 @@ print("=== FinOps Expert with Bing Grounding (Simplified Version) ===")
 # Get required variables with fallbacks
 conn_string = get_env_var("PROJECT_CONNECTION_STRING")
 bing_conn_name = get_env_var("BING_CONNECTION_NAME", 
-                            ["GROUNDING_WITH_BING_CONNECTION_NAME", "BING_SEARCH_KEY"])
+                            ("GROUNDING_WITH_BING_CONNECTION_NAME", "BING_SEARCH_KEY"))
 model_name = get_env_var("MODEL_DEPLOYMENT_NAME", 
-                        ["SERVERLESS_MODEL_NAME"], 
+                        ("SERVERLESS_MODEL_NAME",), 
                         "gpt-4o-mini")
 
 # Validate required variables
@@ -70,7 +101,10 @@ if not bing_conn_name:
     print("❌ BING_CONNECTION_NAME or equivalent is missing! Please check your .env file.")
     sys.exit(1)
 
-print(f"\nProject Connection String: {conn_string[:20]}...{conn_string[-5:] if len(conn_string) > 25 else conn_string}")
+# Only the ends of the connection string are shown in logs
+_CONN_STRING_PREVIEW = f"{conn_string[:20]}...{conn_string[-5:]}" if len(conn_string) > 25 else conn_string
+
+print(f"\nProject Connection String: {_CONN_STRING_PREVIEW}")
 print(f"Bing Connection Name: {bing_conn_name}")
 print(f"Model Name: {model_name}")
 
@@ -80,17 +114,14 @@ bing_connection = None
 
 # Setup client and connection
 try:
-    # Initialize the DefaultAzureCredential
-    print("\nInitializing DefaultAzureCredential...")
-    credential = DefaultAzureCredential()
-    print("✅ DefaultAzureCredential initialized")
+    # Initialize the Azure credential
+    print("\nInitializing Azure credential...")
+    get_credential()
+    print("✅ Azure credential initialized")
     
-    # Initialize AIProjectClient
+    # Initialize AIProjectClient - shared with the other FinOps scripts through finops_client
     print("\nInitializing AIProjectClient...")
-    project_client = AIProjectClient.from_connection_string(
-        credential=credential,
-        conn_str=conn_string
-    )
+    project_client = get_project_client(conn_string)
     print("✅ AIProjectClient initialized successfully")
     
     # Get Bing connection by name (this is the correct way per documentation)
@@ -107,6 +138,9 @@ try:
     except AttributeError:
         print(f"- Type: [Not available in this SDK version]")
     
+    # The Bing grounding tool only depends on the connection, so build its definitions once here
+    _BING_TOOL = BingGroundingTool(connection_id=bing_connection.id)
+    
 except Exception as e:
     print(f"❌ SETUP ERROR: {str(e)}")
     
@@ -133,11 +167,6 @@ def create_finops_agent():
         return None
     
     try:
-        # Initialize Bing grounding tool - use the connection_id from the bing_connection
-        print("\nInitializing Bing grounding tool...")
-        # Following the official pattern from the documentation
-        bing_tool = BingGroundingTool(connection_id=bing_connection.id)
-        
         # Create the agent
         print(f"Creating FinOps agent with model: {model_name}")
         agent = project_client.agents.create_agent(
@@ -177,7 +206,7 @@ def create_finops_agent():
                 NEVER make up information. If you can't find specific information from Microsoft sources,
                 clearly state that the information isn't available in the official documentation.
             """,
-            tools=bing_tool.definitions,
+            tools=_BING_TOOL.definitions,
             temperature=0.2,  # Lower temperature for more focused responses
             headers={"x-ms-enable-preview": "true"},  # Required for Bing grounding
         )
@@ -195,9 +224,65 @@ def create_finops_agent():
         
         return None
 
+# One agent is shared by every question in the process and deleted on exit
+_AGENT = None
+_AGENT_LOCK = threading.Lock()
+
+def get_or_create_finops_agent():
+    """Return the shared FinOps agent, creating it on first use"""
+    global _AGENT
+    if _AGENT is None:
+        with _AGENT_LOCK:
+            if _AGENT is None:
+                _AGENT = create_finops_agent()
+    else:
+        print(f"♻️ Reusing FinOps agent, ID: {_AGENT.id}")
+    return _AGENT
+
+def discard_finops_agent():
+    """Delete the shared agent so the next question starts with a fresh one"""
+    global _AGENT
+    with _AGENT_LOCK:
+        agent, _AGENT = _AGENT, None
+    if agent:
+        try:
+            project_client.agents.delete_agent(agent.id)
+            print(f"✅ Deleted agent: {agent.id}")
+        except Exception as e:
+            print(f"⚠️ Could not delete agent {agent.id}: {str(e)}")
+
+atexit.register(discard_finops_agent)
+
+# Fetches the messages and run steps of a finished run side by side - the SDK client is thread-safe
+_RESULTS_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="finops-results")
+
+# Probed once at import - older SDK versions don't have these ThreadMessage helpers
+HAS_TEXT_MESSAGES = hasattr(ThreadMessage, "text_messages")
+HAS_URL_CITATIONS = hasattr(ThreadMessage, "url_citation_annotations")
+
+# Run statuses that mean the agent is still working
+ACTIVE_RUN_STATUSES = ("queued", "in_progress", "requires_action")
+
+def process_run(thread_id, agent_id, headers=None, additional_instructions=None):
+    """Create a run and poll it to completion, backing off from 100 ms to 1 s between status checks
+
+    Used instead of create_and_process_run, which waits a full second before its first poll."""
+    run = project_client.agents.create_run(
+        thread_id=thread_id,
+        agent_id=agent_id,
+        additional_instructions=additional_instructions,
+        headers=headers
+    )
+    delay = 0.1
+    while run.status in ACTIVE_RUN_STATUSES:
+        time.sleep(delay)
+        delay = min(delay * 1.6, 1.0)
+        run = project_client.agents.get_run(thread_id=thread_id, run_id=run.id)
+    return run
+
 # Function to ask a FinOps question
-def ask_finops_question(agent, question):
-    """Ask a FinOps question using the Bing-grounded agent"""
+def ask_finops_question(agent, question, echo=True):
+    """Ask a FinOps question using the Bing-grounded agent, printing the reply as it streams in when echo is set"""
     if not agent or not project_client:
         print("❌ Agent or project client not available")
         return "Error: Agent or project client not available"
@@ -234,13 +319,44 @@ def ask_finops_question(agent, question):
         )
         print(f"📤 Added user message ID: {message.id}")
         
-        # Process the run - Following the documentation pattern
+        # Stream the run so the reply shows up as it is generated; the completed
+        # message event carries the full text and citations used below
         print("⚙️ Processing agent run (this may take a minute)...")
-        run = project_client.agents.create_and_process_run(
-            thread_id=thread.id,
-            agent_id=agent.id,
-            headers={"x-ms-enable-preview": "true"}  # Ensure preview features are enabled
-        )
+        run = None
+        response_message = None
+        try:
+            with project_client.agents.create_stream(
+                thread_id=thread.id,
+                agent_id=agent.id,
+                headers={"x-ms-enable-preview": "true"}  # Ensure preview features are enabled
+            ) as stream:
+                for event_type, event_data, _ in stream:
+                    if isinstance(event_data, MessageDeltaChunk):
+                        if echo:
+                            sys.stdout.write(event_data.text)
+                            sys.stdout.flush()
+                    elif isinstance(event_data, ThreadMessage):
+                        if event_data.role == MessageRole.AGENT and event_data.status == "completed":
+                            response_message = event_data
+                    elif isinstance(event_data, ThreadRun):
+                        run = event_data
+                    elif event_type == AgentStreamEvent.ERROR:
+                        print(f"❌ Stream error: {event_data}")
+            if echo:
+                print()
+        except Exception as stream_error:
+            # Only fall back when no run was started - otherwise the question would be asked twice
+            if run is not None:
+                raise
+            print(f"⚠️ Streaming unavailable ({str(stream_error)}), waiting for the complete run instead")
+            run = process_run(
+                thread_id=thread.id,
+                agent_id=agent.id,
+                headers={"x-ms-enable-preview": "true"}
+            )
+        
+        if run is None:
+            return "Error: Run stream ended without any run status"
         
         print(f"✅ Run completed with status: {run.status}")
         
@@ -248,131 +364,138 @@ def ask_finops_question(agent, question):
             print(f"❌ Run failed: {run.last_error}")
             return f"Error: {run.last_error}"
         
-        # Get the response
-        try:
-            response_message = project_client.agents.list_messages(thread_id=thread.id).get_last_message_by_role(
-                MessageRole.AGENT
-            )
-        except AttributeError:
-            # Fallback method if get_last_message_by_role is not available
-            print("Using fallback method to get response message")
+        # The run steps are only needed for the debug section, so fetch them while the answer is assembled
+        run_steps_future = _RESULTS_POOL.submit(project_client.agents.list_run_steps, thread_id=thread.id, run_id=run.id)
+        
+        # Get the response if it didn't arrive through the stream
+        if response_message is None:
             messages = project_client.agents.list_messages(thread_id=thread.id)
-            response_message = None
-            for msg in messages.data:
-                if msg.role == MessageRole.AGENT:
-                    response_message = msg
-                    break
+            try:
+                response_message = messages.get_last_message_by_role(MessageRole.AGENT)
+            except AttributeError:
+                # Fallback method if get_last_message_by_role is not available
+                print("Using fallback method to get response message")
+                for msg in messages.data:
+                    if msg.role == MessageRole.AGENT:
+                        response_message = msg
+                        break
         
         if not response_message:
             return "Error: No response received from the agent"
         
-        # Format the response with text and citations
-        answer = ""
+        # Format the response with text and citations - collected as parts and joined once at the end
+        answer_parts = []
         
         # Add text content
-        try:
-            for text_message in response_message.text_messages:
-                answer += text_message.text.value
-        except AttributeError:
+        if HAS_TEXT_MESSAGES:
+            answer_parts.append("".join(text_message.text.value for text_message in response_message.text_messages))
+        elif hasattr(response_message, 'content'):
             # Fallback if text_messages is not available
-            if hasattr(response_message, 'content'):
-                answer = response_message.content
-            else:
-                print("Warning: Could not extract message content using standard methods")
-                answer = "Could not extract message content. Please check the API response format."
+            answer_parts.append(response_message.content)
+        else:
+            print("Warning: Could not extract message content using standard methods")
+            answer_parts.append("Could not extract message content. Please check the API response format.")
         
         # Add URL citations (according to the documentation)
         try:
-            if hasattr(response_message, 'url_citation_annotations') and response_message.url_citation_annotations:
-                answer += "\n\n## References\n"
+            if HAS_URL_CITATIONS and response_message.url_citation_annotations:
+                answer_parts.append("\n\n## References\n")
                 for i, annotation in enumerate(response_message.url_citation_annotations, 1):
                     citation = annotation.url_citation
-                    answer += f"{i}. [{citation.title}]({citation.url})\n"
+                    answer_parts.append(f"{i}. [{citation.title}]({citation.url})\n")
         except Exception as citation_err:
             print(f"Warning: Could not extract citations: {str(citation_err)}")
         
         # Detailed debug - Get Bing search URLs from run steps
-        print("\n===== DEBUG: BING SEARCH DETAILS =====")
+        if DEBUG:
+            print("\n===== DEBUG: BING SEARCH DETAILS =====")
         try:
-            run_steps = project_client.agents.list_run_steps(thread_id=thread.id, run_id=run.id)
-            print(f"Run steps available: {run_steps is not None}")
+            run_steps = run_steps_future.result()
+            if DEBUG:
+                print(f"Run steps available: {run_steps is not None}")
             
             if run_steps and 'data' in run_steps:
-                print(f"Number of run steps: {len(run_steps['data'])}")
+                if DEBUG:
+                    print(f"Number of run steps: {len(run_steps['data'])}")
                 
-                bing_urls = []
-                github_urls = []
-                mslearn_urls = []
+                # Dicts keep the URLs unique in the order they were found
+                bing_urls = {}
+                github_urls = {}
+                mslearn_urls = {}
                 
                 for step in run_steps['data']:
-                    step_type = step.get('type', step.get('step_type', 'unknown'))
-                    print(f"Step type: {step_type}")
-                    
                     # Print step for debugging
-                    if 'tool' in step:
-                        print(f"Tool: {step['tool']}")
+                    if DEBUG:
+                        print(f"Step type: {step.get('type', step.get('step_type', 'unknown'))}")
+                        if 'tool' in step:
+                            print(f"Tool: {step['tool']}")
                     
                     params = step.get('parameters', {})
                     if 'request_url' in params:
                         original_url = params['request_url']
                         friendly_url = original_url.replace("api.bing.microsoft.com", "www.bing.com")
-                        bing_urls.append(friendly_url)
-                        print(f"Found search URL: {friendly_url}")
+                        if friendly_url in bing_urls:
+                            continue
+                        bing_urls[friendly_url] = None
+                        if DEBUG:
+                            print(f"Found search URL: {friendly_url}")
                         
                         # Track GitHub and Microsoft Learn URLs
                         if 'github.com/microsoft/finops-toolkit' in original_url:
-                            github_urls.append(friendly_url)
-                            print(f"GitHub URL found: {friendly_url}")
+                            github_urls[friendly_url] = None
+                            if DEBUG:
+                                print(f"GitHub URL found: {friendly_url}")
                         
                         if 'learn.microsoft.com' in original_url or 'docs.microsoft.com/azure' in original_url:
-                            mslearn_urls.append(friendly_url)
-                            print(f"Microsoft Learn URL found: {friendly_url}")
+                            mslearn_urls[friendly_url] = None
+                            if DEBUG:
+                                print(f"Microsoft Learn URL found: {friendly_url}")
+                        
+                        # Only the first few searches are listed, so stop scanning once we have them
+                        if len(bing_urls) >= MAX_SEARCH_URLS:
+                            break
                 
                 if not bing_urls:
                     print("⚠️ No Bing search URLs found in run steps")
                     
                     # Add fallback URLs if none found
-                    github_urls.append("https://github.com/microsoft/finops-toolkit")
-                    mslearn_urls.append("https://learn.microsoft.com/en-us/azure/cost-management-billing/finops/")
+                    github_urls["https://github.com/microsoft/finops-toolkit"] = None
+                    mslearn_urls["https://learn.microsoft.com/en-us/azure/cost-management-billing/finops/"] = None
                 
                 # Add search URLs to answer
                 if bing_urls:
-                    answer += "\n\n## Bing Search Queries\n"
-                    for i, url in enumerate(bing_urls[:10], 1):  # Limit to 10
-                        answer += f"{i}. [Search: FinOps Documentation]({url})\n"
+                    answer_parts.append("\n\n## Bing Search Queries\n")
+                    for i, url in enumerate(bing_urls, 1):
+                        answer_parts.append(f"{i}. [Search: FinOps Documentation]({url})\n")
                 
                 # Add GitHub repository section
                 if github_urls:
-                    answer += "\n\n## Microsoft FinOps Toolkit GitHub Resources\n"
-                    answer += "The following resources from the Microsoft FinOps Toolkit GitHub repository are relevant:\n\n"
+                    answer_parts.append("\n\n## Microsoft FinOps Toolkit GitHub Resources\n")
+                    answer_parts.append("The following resources from the Microsoft FinOps Toolkit GitHub repository are relevant:\n\n")
                     for i, url in enumerate(github_urls, 1):
-                        answer += f"{i}. [FinOps Toolkit Resource]({url})\n"
+                        answer_parts.append(f"{i}. [FinOps Toolkit Resource]({url})\n")
                 else:
-                    answer += "\n\n## Microsoft FinOps Toolkit GitHub Resources\n"
-                    answer += "For implementation examples, templates, and scripts, explore the [Microsoft FinOps Toolkit repository](https://github.com/microsoft/finops-toolkit).\n"
+                    answer_parts.append(GITHUB_FALLBACK_SECTION)
                 
                 # Add Microsoft Learn section
                 if mslearn_urls:
-                    answer += "\n\n## Microsoft Learn Documentation\n"
-                    answer += "The following Microsoft Learn resources provide authoritative guidance:\n\n"
+                    answer_parts.append("\n\n## Microsoft Learn Documentation\n")
+                    answer_parts.append("The following Microsoft Learn resources provide authoritative guidance:\n\n")
                     for i, url in enumerate(mslearn_urls, 1):
-                        answer += f"{i}. [Microsoft Documentation]({url})\n"
+                        answer_parts.append(f"{i}. [Microsoft Documentation]({url})\n")
                 else:
-                    answer += "\n\n## Microsoft Learn Documentation\n"
-                    answer += "For official guidance, refer to [Microsoft's FinOps documentation](https://learn.microsoft.com/en-us/azure/cost-management-billing/finops/).\n"
+                    answer_parts.append(MSLEARN_FALLBACK_SECTION)
             else:
                 print("⚠️ No run steps data available")
         except Exception as search_err:
             print(f"⚠️ Error retrieving Bing search URLs: {str(search_err)}")
             # Add default references if we couldn't get search URLs
-            answer += "\n\n## Key Resources\n"
-            answer += "1. [Microsoft FinOps Toolkit on GitHub](https://github.com/microsoft/finops-toolkit)\n"
-            answer += "2. [Microsoft FinOps Documentation](https://learn.microsoft.com/en-us/azure/cost-management-billing/finops/)\n"
-            answer += "3. [Azure Cost Management Documentation](https://learn.microsoft.com/en-us/azure/cost-management-billing/costs/)\n"
+            answer_parts.append(KEY_RESOURCES_SECTION)
         
-        print("===== END DEBUG =====\n")
+        if DEBUG:
+            print("===== END DEBUG =====\n")
         
-        return answer
+        return "".join(answer_parts)
     
     except Exception as e:
         print(f"❌ Error asking FinOps question: {str(e)}")
@@ -385,36 +508,82 @@ def finops_expert(question):
     print(f"FinOps Expert Question: {question}")
     print("="*80 + "\n")
     
-    # Create agent
-    agent = create_finops_agent()
+    # Reuse the agent from earlier questions, creating it on first use
+    agent = get_or_create_finops_agent()
     
     if not agent:
         return "Error: Could not create FinOps agent. Check the logs for details."
     
     try:
         # Get answer
-        answer = ask_finops_question(agent, question)
-        
-        # Clean up
-        print(f"\nCleaning up agent...")
-        project_client.agents.delete_agent(agent.id)
-        print(f"✅ Deleted agent: {agent.id}")
-        
-        return answer
+        return ask_finops_question(agent, question)
     
     except Exception as e:
         print(f"❌ Error in finops_expert: {str(e)}")
         
-        # Try to clean up
-        try:
-            if agent:
-                project_client.agents.delete_agent(agent.id)
-                print(f"✅ Deleted agent during error cleanup: {agent.id}")
-        except:
-            pass
+        # The agent may be what failed, so don't reuse it for the next question
+        discard_finops_agent()
             
         return f"Error: {str(e)}"
 
+def ask_finops_questions_batched(questions):
+    """Ask several FinOps questions in one thread: one message per question and a single run that answers them all"""
+    agent = get_or_create_finops_agent()
+    if not agent or not project_client:
+        print("❌ Agent or project client not available")
+        return "Error: Agent or project client not available"
+    
+    try:
+        thread = project_client.agents.create_thread()
+        print(f"📝 Created thread ID: {thread.id}")
+        
+        for question in questions:
+            message = project_client.agents.create_message(
+                thread_id=thread.id,
+                role=MessageRole.USER,
+                content=question
+            )
+            print(f"📤 Added user message ID: {message.id}")
+        
+        # A run replies once to the whole thread, so have it cover every question in turn
+        print("⚙️ Processing agent run (this may take a minute)...")
+        run = process_run(
+            thread_id=thread.id,
+            agent_id=agent.id,
+            headers={"x-ms-enable-preview": "true"},
+            additional_instructions=(
+                f"The user asked {len(questions)} questions in separate messages. Answer each of them in order, "
+                "under a '## ' heading that repeats the question, with links to the Microsoft FinOps Toolkit "
+                "GitHub repository and Microsoft Learn where relevant."
+            )
+        )
+        print(f"✅ Run completed with status: {run.status}")
+        
+        if run.status == "failed":
+            print(f"❌ Run failed: {run.last_error}")
+            return f"Error: {run.last_error}"
+        
+        messages = project_client.agents.list_messages(thread_id=thread.id)
+        response_message = messages.get_last_message_by_role(MessageRole.AGENT)
+        if not response_message:
+            return "Error: No response received from the agent"
+        
+        if HAS_TEXT_MESSAGES:
+            answer_parts = ["".join(text_message.text.value for text_message in response_message.text_messages)]
+        else:
+            answer_parts = [str(response_message.content)]
+        if HAS_URL_CITATIONS and response_message.url_citation_annotations:
+            answer_parts.append("\n\n## References\n")
+            for i, annotation in enumerate(response_message.url_citation_annotations, 1):
+                citation = annotation.url_citation
+                answer_parts.append(f"{i}. [{citation.title}]({citation.url})\n")
+        return "".join(answer_parts)
+    
+    except Exception as e:
+        print(f"❌ Error asking FinOps questions: {str(e)}")
+        discard_finops_agent()
+        return f"Error: {str(e)}"
+
 # Example usage
 if __name__ == "__main__":
     print("\n===== FinOps Expert with Bing Grounding (Debug Version) =====")
@@ -431,17 +600,36 @@ if __name__ == "__main__":
     for i, q in enumerate(test_questions, 1):
         print(f"{i}. {q}")
     print(f"{len(test_questions) + 1}. Enter custom question")
+    print(f"{len(test_questions) + 2}. Ask all test questions at once")
     
+    ask_all = False
     try:
-        choice = int(input("\nEnter question number (1-4): "))
+        choice = int(input(f"\nEnter question number (1-{len(test_questions) + 2}): "))
         if 1 <= choice <= len(test_questions):
             sample_question = test_questions[choice - 1]
+        elif choice == len(test_questions) + 2:
+            ask_all = True
         else:
             sample_question = input("\nEnter your custom FinOps question: ")
     except ValueError:
         print("Invalid choice, using default question.")
         sample_question = test_questions[0]
     
+    if ask_all:
+        # One thread and one run for all the questions instead of a full run cycle per question
+        print(f"\nProcessing {len(test_questions)} questions in a single run - this may take a minute...")
+        start_time = time.time()
+        response = ask_finops_questions_batched(test_questions)
+        elapsed_time = time.time() - start_time
+        
+        print("\n" + "="*80)
+        print("RESPONSE:")
+        print("="*80)
+        print(response)
+        print(f"\n⏱️ Total response time for {len(test_questions)} questions: {elapsed_time:.2f} seconds")
+        print("\n===== TEST COMPLETED =====")
+        sys.exit(0)
+    
     print(f"\n🔍 Selected question: {sample_question}")
     print("\nProcessing question - this may take a minute...")
     
@@ -472,9 +660,8 @@ if __name__ == "__main__":
     save_option = input("\nSave response to file? (y/n): ").lower()
     if save_option.startswith('y'):
         # Create a safe filename from the question
-        import re
-        safe_filename = re.sub(r'[^\w\s-]', '', sample_question).strip().lower()
-        safe_filename = re.sub(r'[-\s]+', '-', safe_filename)[:50]
+        safe_filename = UNSAFE_FILENAME_CHARS_RE.sub('', sample_question).strip().lower()
+        safe_filename = FILENAME_SEPARATORS_RE.sub('-', safe_filename)[:50]
         filename = f"finops_response_{safe_filename}.md"
         
         try:
@@ -4,24 +4,20 @@
 
 import os
 import sys
-from pathlib import Path
+import functools
+import dotenv
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
 from azure.ai.projects.models import BingGroundingTool
+from finops_client import get_credential, get_project_client
 
 # Find and load .env file
+@functools.lru_cache(maxsize=1)
 def find_dotenv():
-    """Find .env file by searching up the directory tree"""
-    current_path = Path().absolute()
-    
-    # Try current directory and up to 3 levels up
-    for _ in range(4):
-        env_path = current_path / '.env'
-        if env_path.exists():
-            print(f"Found .env file at: {env_path}")
-            return env_path
-        current_path = current_path.parent
+    """Find .env file by searching up the directory tree from the working directory (result is cached)"""
+    env_path = dotenv.find_dotenv(usecwd=True)
+    if env_path:
+        print(f"Found .env file at: {env_path}")
+        return env_path
     
     # Default to current directory .env if not found
     print("Could not find .env file, defaulting to current directory")
@@ -46,17 +42,14 @@ print(f"\nProject Connection String: {conn_string[:20]}...{conn_string[-5:] if l
 print(f"Bing Connection Name: {bing_conn_name}")
 
 try:
-    # Initialize the DefaultAzureCredential
-    print("\nInitializing DefaultAzureCredential...")
-    credential = DefaultAzureCredential()
-    print("✅ DefaultAzureCredential initialized")
+    # Initialize the Azure credential
+    print("\nInitializing Azure credential...")
+    get_credential()
+    print("✅ Azure credential initialized")
     
-    # Initialize AIProjectClient
+    # Initialize AIProjectClient - shared with the other FinOps scripts through finops_client
     print("\nInitializing AIProjectClient...")
-    project_client = AIProjectClient.from_connection_string(
-        credential=credential,
-        conn_str=conn_string
-    )
+    project_client = get_project_client(conn_string)
     print("✅ AIProjectClient initialized successfully")
     
     # Get Bing connection
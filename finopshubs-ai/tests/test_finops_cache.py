@@ -0,0 +1,94 @@
+"""Tests for finops_cache - run from the finopshubs-ai directory with: python -m unittest discover tests"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from finops_cache import SemanticAnswerCache, config_variant
+
+
+def fake_embed(text):
+    """Embed by counting the letters a-z - anagrams and case/spacing variants get the same vector"""
+    return [text.count(letter) + 0.01 for letter in "abcdefghijklmnopqrstuvwxyz"]
+
+
+class ConfigVariantTests(unittest.TestCase):
+
+    def test_defaults_give_an_empty_variant(self):
+        self.assertEqual(config_variant({"a": 1, "b": True}, {"a": 1, "b": True}), "")
+        self.assertEqual(config_variant({}, {"a": 1}), "")
+
+    def test_only_differing_options_in_sorted_order(self):
+        self.assertEqual(config_variant({"b": False, "a": 2, "c": 3}, {"a": 1, "b": True, "c": 3}), "a=2,b=False")
+
+    def test_unknown_options_are_ignored(self):
+        self.assertEqual(config_variant({"stream_output": False}, {"a": 1}), "")
+
+
+class SemanticAnswerCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def make_cache(self, **kwargs):
+        return SemanticAnswerCache(self.directory.name, "answers", embed=fake_embed, **kwargs)
+
+    def test_key(self):
+        self.assertEqual(SemanticAnswerCache._key("  What IS  FinOps? "), "what is finops?")
+        self.assertEqual(SemanticAnswerCache._key("What is FinOps?", "a=2"), "a=2\x1fwhat is finops?")
+
+    def test_exact_and_paraphrased_lookup(self):
+        cache = self.make_cache()
+        cache.put("What is FinOps?", "answer")
+        self.assertEqual(cache.lookup("what is  finops?"), "answer")
+        self.assertEqual(cache.lookup("What is FinOps"), "answer")
+        self.assertIsNone(cache.lookup("How do I tag Azure resources?"))
+
+    def test_variants_are_kept_apart(self):
+        cache = self.make_cache()
+        cache.put("What is FinOps?", "plain")
+        cache.put("What is FinOps?", "enhanced", variant="enhance=True")
+        self.assertEqual(cache.lookup("What is FinOps?"), "plain")
+        self.assertEqual(cache.lookup("What is FinOps", variant="enhance=True"), "enhanced")
+        self.assertIsNone(cache.lookup("What is FinOps?", variant="other=1"))
+
+    def test_lookup_without_embeddings_matches_exact_repeats_only(self):
+        cache = SemanticAnswerCache(self.directory.name, "answers")
+        cache.put("What is FinOps?", "answer")
+        self.assertEqual(cache.lookup("WHAT is finops?"), "answer")
+        self.assertIsNone(cache.lookup("What is FinOps"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = self.make_cache(maxsize=2)
+        cache.put("first question", "1")
+        cache.put("second question", "2")
+        cache.lookup("first question")
+        cache.put("third one", "3")
+        self.assertEqual(cache.lookup("first question"), "1")
+        self.assertIsNone(cache.lookup("second question"))
+
+    def test_expired_entries_are_not_returned(self):
+        cache = self.make_cache(ttl=-1)
+        cache.put("What is FinOps?", "answer")
+        self.assertIsNone(cache.lookup("What is FinOps?"))
+
+    def test_put_persists_the_snapshot(self):
+        self.make_cache().put("What is FinOps?", "answer", variant="a=2")
+        reloaded = self.make_cache()
+        self.assertEqual(reloaded.lookup("What is FinOps", variant="a=2"), "answer")
+        self.assertIsNone(reloaded.lookup("What is FinOps"))
+
+    def test_coalesce_returns_the_computed_answer(self):
+        cache = self.make_cache()
+        self.assertEqual(cache.coalesce("q", lambda: "answer"), "answer")
+        with self.assertRaises(ValueError):
+            cache.coalesce("q", lambda: (_ for _ in ()).throw(ValueError()))
+        self.assertEqual(cache._inflight, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Tests for finops_text - run from the finopshubs-ai directory with: python -m unittest discover tests"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from finops_text import answer_similarity, normalize_url, parse_evaluation, split_batch_answer, url_match_key
+
+EVALUATION = """Overall Score:
+7/10
+
+Strengths:
+- Covers the FinOps Framework phases
+• Mentions the FinOps toolkit
+1. Links to Cost Management docs
+
+Weaknesses:
+- No example KQL queries
+Plain text under a list section is ignored
+
+Improvement Suggestions:
+2. Add a sample Power BI report
+
+Evaluation Summary:
+A solid answer overall.
+It could use more examples.
+"""
+
+
+class ParseEvaluationTests(unittest.TestCase):
+
+    def test_sections(self):
+        results = parse_evaluation(EVALUATION)
+        self.assertEqual(results["overall_score"], 7)
+        self.assertEqual(results["strengths"], [
+            "Covers the FinOps Framework phases",
+            "Mentions the FinOps toolkit",
+            "Links to Cost Management docs"
+        ])
+        self.assertEqual(results["weaknesses"], ["No example KQL queries"])
+        self.assertEqual(results["improvement_suggestions"], ["Add a sample Power BI report"])
+        self.assertEqual(results["evaluation_summary"], "A solid answer overall. It could use more examples.")
+
+    def test_headers_match_in_any_case_at_line_start(self):
+        results = parse_evaluation("overall score:\n10\nSTRENGTHS\n- Clear")
+        self.assertEqual(results["overall_score"], 10)
+        self.assertEqual(results["strengths"], ["Clear"])
+
+    def test_score_on_the_header_line_is_not_read(self):
+        # Header lines are skipped, so the score is estimated from the text instead
+        self.assertEqual(parse_evaluation("Overall Score: 9/10")["overall_score"], 5)
+
+    def test_first_score_in_section_wins(self):
+        self.assertEqual(parse_evaluation("Overall Score\nabout 6, not 9")["overall_score"], 6)
+
+    def test_score_out_of_range_is_not_taken(self):
+        # No 1-10 number, and no scoring terms: the mixed estimate is used
+        self.assertEqual(parse_evaluation("Overall Score: 42")["overall_score"], 5)
+
+    def test_estimated_score_without_a_score_section(self):
+        self.assertEqual(parse_evaluation("An excellent, thorough and accurate answer")["overall_score"], 7)
+        self.assertEqual(parse_evaluation("Poor, unclear and incorrect")["overall_score"], 2)
+
+    def test_empty_evaluation(self):
+        self.assertEqual(parse_evaluation(""), {
+            "overall_score": 5,
+            "strengths": [],
+            "weaknesses": [],
+            "improvement_suggestions": [],
+            "evaluation_summary": ""
+        })
+
+
+class AnswerSimilarityTests(unittest.TestCase):
+
+    def test_identical_texts(self):
+        self.assertEqual(answer_similarity("a b c d e f", "a b c d e f"), 1.0)
+
+    def test_disjoint_texts(self):
+        self.assertEqual(answer_similarity("a b c d e f", "g h i j k l"), 0.0)
+
+    def test_exact_jaccard_for_short_texts(self):
+        # Shingles {abcd, bcde, cdef} and {abcd, bcde, cdeg}: 2 shared out of 4
+        self.assertEqual(answer_similarity("a b c d e f", "a b c d e g"), 0.5)
+
+    def test_texts_shorter_than_a_shingle(self):
+        self.assertEqual(answer_similarity("tags", "tags"), 1.0)
+        self.assertEqual(answer_similarity("", ""), 1.0)
+
+    def test_estimate_for_long_texts(self):
+        words = [f"w{i}" for i in range(2000)]
+        a = " ".join(words)
+        b = " ".join(words[:1000] + [f"x{i}" for i in range(1000)])
+        # True Jaccard is 997 / 3003 shingles, about 0.33
+        self.assertAlmostEqual(answer_similarity(a, b), 997 / 3003, delta=0.12)
+        self.assertEqual(answer_similarity(a, b), answer_similarity(b, a))
+
+
+class UrlTests(unittest.TestCase):
+
+    def test_normalize_url(self):
+        self.assertEqual(normalize_url("https://learn.microsoft.com/a"), "https://learn.microsoft.com/a")
+        self.assertEqual(normalize_url("http://example.com"), "http://example.com")
+        self.assertEqual(normalize_url("//github.com/microsoft"), "https://github.com/microsoft")
+        self.assertEqual(normalize_url("github.com/microsoft"), "https://github.com/microsoft")
+
+    def test_bing_search_links_use_the_default(self):
+        url = "https://www.bing.com/search?q=finops"
+        self.assertEqual(normalize_url(url, "https://github.com/microsoft/finops-toolkit"), "https://github.com/microsoft/finops-toolkit")
+        self.assertEqual(normalize_url(url), url)
+
+    def test_url_match_key(self):
+        key = url_match_key("https://learn.microsoft.com/a")
+        self.assertEqual(url_match_key("https://Learn.Microsoft.com/a/"), key)
+        self.assertEqual(url_match_key("learn.microsoft.com/a."), key)
+        self.assertEqual(url_match_key("https://learn.microsoft.com/a>,"), key)
+        self.assertNotEqual(url_match_key("https://learn.microsoft.com/b"), key)
+
+
+class SplitBatchAnswerTests(unittest.TestCase):
+
+    def test_split_and_assign_citations(self):
+        answer = (
+            "Here are the answers.\n"
+            "### Q1\nUse tags 【3:0†source】.\n"
+            "###Q2  \nSee https://learn.microsoft.com/b for details.\n"
+        )
+        tags = {"title": "Tags", "url": "https://learn.microsoft.com/a", "markers": ["【3:0†source】"]}
+        budgets = {"title": "Budgets", "url": "https://learn.microsoft.com/b", "markers": []}
+        self.assertEqual(split_batch_answer(answer, [tags, budgets]), {
+            1: ("Use tags 【3:0†source】.", [tags]),
+            2: ("See https://learn.microsoft.com/b for details.", [budgets])
+        })
+
+    def test_headings_must_be_on_their_own_line(self):
+        self.assertEqual(split_batch_answer("Answer for ### Q1 inline", []), {})
+
+    def test_citations_without_markers(self):
+        citation = {"title": "A", "url": "https://a.com"}
+        self.assertEqual(split_batch_answer("### Q1\nnothing cited", [citation]), {1: ("nothing cited", [])})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Checks that inspect.cleandoc only strips the source indentation from the prompt constants
+
+The prompts are read from the script's source with ast, so the test runs without the Azure SDKs.
+Run from the finopshubs-ai directory with: python -m unittest discover tests"""
+
+import ast
+import inspect
+import textwrap
+import unittest
+from pathlib import Path
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "finops_expert_with_bing_grounding_original.py"
+
+
+def cleandoc_prompts():
+    """Return (line number, raw text) for every inspect.cleandoc("...") call on a string literal in the script"""
+    tree = ast.parse(SCRIPT_PATH.read_text(encoding="utf-8"))
+    return [
+        (node.lineno, node.args[0].value)
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "cleandoc"
+        and node.args
+        and isinstance(node.args[0], ast.Constant)
+    ]
+
+
+class CleandocPromptTests(unittest.TestCase):
+
+    def setUp(self):
+        self.prompts = cleandoc_prompts()
+
+    def test_prompts_are_found(self):
+        self.assertGreaterEqual(len(self.prompts), 5)
+
+    def test_only_common_indentation_is_removed(self):
+        for lineno, raw in self.prompts:
+            with self.subTest(line=lineno):
+                # cleandoc expands tabs, which would change the text beyond its indentation
+                self.assertNotIn("\t", raw)
+
+                # The prompt as previously sent, with the indentation the source code added removed
+                first_line, _, rest = raw.partition("\n")
+                expected = (first_line.strip() + "\n" + textwrap.dedent(rest)).strip("\n")
+                self.assertEqual(
+                    [line.rstrip() for line in inspect.cleandoc(raw).splitlines()],
+                    [line.rstrip() for line in expected.splitlines()]
+                )
+
+    def test_nested_list_indentation_is_kept(self):
+        evaluation_prompt = next(raw for _, raw in self.prompts if raw.startswith("You are a FinOps Answer Evaluator"))
+        cleaned_lines = inspect.cleandoc(evaluation_prompt).splitlines()
+        self.assertIn("1. Accuracy (30%):", cleaned_lines)
+        self.assertIn("   - Is the technical information correct?", cleaned_lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,39 +1,61 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import orjson
 import uvicorn
+
+# Configure logging once for the whole app - request handlers only enqueue records,
+# and a background listener thread formats them and writes them to stderr
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)])
+logger = logging.getLogger("finopshubs." + __name__)
+
 from app.routers import finops
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
-logger = logging.getLogger(__name__)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the FinOps Expert module before the server accepts requests"""
+    # Loading runs the module's Azure setup (credential, project client, Bing connection),
+    # which would otherwise stall the first requests
+    finops_expert = await run_in_threadpool(finops.load_finops_expert)
+    if finops_expert is None:
+        logger.warning("FinOps Expert module could not be loaded at startup - it will be retried on the first request")
+    yield
 
 # Create FastAPI app
 app = FastAPI(
     title="FinOps Hubs UI API",
     description="API for FinOps Hubs UI",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# Configure CORS
-origins = [
-    "http://localhost:3000",   # Frontend on port 3000
-    "http://127.0.0.1:3000",   # Alternate localhost
-    "http://localhost:5173",   # Vite default port
-    "http://127.0.0.1:5173",   # Alternate Vite
-]
+# Constant bodies of the root and health endpoints, encoded once - health checks are polled frequently
+ROOT_RESPONSE_BODY = orjson.dumps({"message": "Welcome to FinOps Hubs UI API"})
+HEALTH_RESPONSE_BODY = orjson.dumps({"status": "ok"})
+
+# Configure CORS - the frontend on port 3000 or the Vite default port 5173, via localhost or 127.0.0.1
+ALLOWED_ORIGIN_REGEX = r"^http://(localhost|127\.0\.0\.1):(3000|5173)$"
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origin_regex=ALLOWED_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["*"],
+    allow_headers=["content-type", "authorization"],
 )
 
 # Include routers
@@ -42,17 +64,17 @@ app.include_router(finops.router)
 # Root endpoint
 @app.get("/")
 async def read_root():
-    return {"message": "Welcome to FinOps Hubs UI API"}
+    return Response(content=ROOT_RESPONSE_BODY, media_type="application/json")
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
+    return Response(content=HEALTH_RESPONSE_BODY, media_type="application/json")
 
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {str(exc)}")
+    logger.error("Unhandled exception: %s", exc)
     return JSONResponse(
         status_code=500,
         content={"message": "An internal server error occurred"},
@@ -61,4 +83,8 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Run the app
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run("app.main:app", host="127.0.0.1", port=port, reload=True) 
\ No newline at end of file
+    # The file watcher is for development only - set UVICORN_RELOAD=1 to turn it on
+    reload = os.environ.get("UVICORN_RELOAD", "0") == "1"
+    # "auto" picks uvloop and httptools (installed with uvicorn[standard]) where they are available -
+    # uvloop doesn't support Windows, so naming it explicitly would break the server there
+    uvicorn.run("app.main:app", host="127.0.0.1", port=port, reload=reload, loop="auto", http="auto") 
\ No newline at end of file
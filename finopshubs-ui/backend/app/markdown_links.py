@@ -0,0 +1,36 @@
+"""Markdown link extraction for answer sources - kept free of FastAPI so it can be tested on its own"""
+
+
+def extract_markdown_links(text):
+    """Return the markdown links ([title](http...)) in text as (title, url) pairs
+
+    Same results as re.findall(r'\\[(.*?)\\]\\((https?://[^\\s)]+)\\)', text) in one forward scan: a link opens
+    at the first '[' that can start one, its title is the shortest run up to a '](' followed by a valid URL
+    and may not span lines, and scanning resumes after the link."""
+    links = []
+    length = len(text)
+    position = 0
+    while True:
+        open_bracket = text.find("[", position)
+        if open_bracket == -1:
+            return links
+        line_end = text.find("\n", open_bracket)
+        if line_end == -1:
+            line_end = length
+
+        # Try each '](' on the same line in order - the first one followed by a valid URL closes the title
+        close_bracket = text.find("](", open_bracket + 1, line_end)
+        while close_bracket != -1:
+            url_start = close_bracket + 2
+            scheme_length = 8 if text.startswith("https://", url_start) else 7 if text.startswith("http://", url_start) else 0
+            if scheme_length:
+                # The URL runs up to the closing parenthesis and may not contain whitespace
+                url_end = url_start + scheme_length
+                while url_end < length and text[url_end] != ")" and not text[url_end].isspace():
+                    url_end += 1
+                if url_end > url_start + scheme_length and url_end < length and text[url_end] == ")":
+                    links.append((text[open_bracket + 1:close_bracket], text[url_start:url_end]))
+                    break
+            close_bracket = text.find("](", close_bracket + 1, line_end)
+
+        position = open_bracket + 1 if close_bracket == -1 else url_end + 1
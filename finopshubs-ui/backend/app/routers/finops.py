@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Body, Request, Response, Depends
 from fastapi.responses import StreamingResponse
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 from pydantic import BaseModel
 import sys
 import os
@@ -7,29 +8,28 @@ import logging
 from typing import Dict, Any, Optional, List
 import time
 import asyncio
+import threading
 import io
 import importlib.util
-import json
-import traceback
+from pathlib import Path
+import orjson
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
-logger = logging.getLogger(__name__)
+from app.markdown_links import extract_markdown_links
+
+# Logging is configured by app.main
+logger = logging.getLogger("finopshubs." + __name__)
+
+# The expert modules live in the backend directory, two levels above app/routers
+BACKEND_DIR = Path(__file__).resolve().parents[2]
 
 # Path to the finops_expert_with_bing_grounding.py file
-FINOPS_EXPERT_PATH = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
-    "finops_expert_with_bing_grounding.py"
-)
+FINOPS_EXPERT_PATH = str(BACKEND_DIR / "finops_expert_with_bing_grounding.py")
 
 # Path to the simplified version of the module
-FINOPS_EXPERT_SIMPLIFIED_PATH = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
-    "finops_expert_simplified.py"
-)
+FINOPS_EXPERT_SIMPLIFIED_PATH = str(BACKEND_DIR / "finops_expert_simplified.py")
+
+# Body of the /test endpoint, encoded once
+TEST_RESPONSE_BODY = orjson.dumps({"status": "ok", "message": "FinOps API is working"})
 
 # Create router
 router = APIRouter(
@@ -47,23 +47,64 @@ class AnswerResponse(BaseModel):
     answer: str
     sources: Optional[List[Dict[str, str]]] = None
 
-# Global variable to cache the module
+# Global variables to cache the module, the file it was loaded from (and its mtime) and its public functions
 _finops_expert_module = None
+_finops_expert_path = None
+_finops_expert_mtime = None
+_finops_expert_functions = ()
+
+# Directories already added to sys.path by _try_load_module
+_SYS_PATH_ADDED = set()
+
+# Serializes loading, so concurrent first requests don't each execute the module (and its Azure setup)
+_LOAD_LOCK = threading.Lock()
+
+def _module_mtime(module_path):
+    try:
+        return os.path.getmtime(module_path)
+    except OSError:
+        return None
+
+def _cache_module(module, module_path):
+    global _finops_expert_module, _finops_expert_path, _finops_expert_mtime, _finops_expert_functions
+    _finops_expert_module = module
+    _finops_expert_path = module_path
+    _finops_expert_mtime = _module_mtime(module_path)
+    # Read the module namespace directly - same names and order as dir(module), without a getattr per name
+    namespace = vars(module)
+    _finops_expert_functions = tuple(
+        name for name in sorted(namespace) if not name.startswith('_') and callable(namespace[name])
+    )
+    logger.info("Available functions in module: %s", ", ".join(_finops_expert_functions))
+
+def get_finops_expert_functions():
+    """Public functions of the loaded FinOps Expert module, computed once per load"""
+    return _finops_expert_functions
+
+def _is_cached_module_current():
+    return _finops_expert_module is not None and _module_mtime(_finops_expert_path) == _finops_expert_mtime
 
 # Load the finops_expert module dynamically
 def load_finops_expert():
     """Tries to load the finops_expert module, with fallback to simplified version"""
-    global _finops_expert_module
-    
-    # Return cached module if available
-    if _finops_expert_module is not None:
+    # Return cached module if available and its file hasn't changed since it was loaded
+    if _is_cached_module_current():
         return _finops_expert_module
     
+    with _LOAD_LOCK:
+        # Another request may have finished loading while this one waited
+        if _is_cached_module_current():
+            return _finops_expert_module
+        if _finops_expert_module is not None:
+            logger.info("%s changed on disk, reloading", _finops_expert_path)
+        return _load_finops_expert_uncached()
+
+def _load_finops_expert_uncached():
     # First try the main module
     finops_expert = _try_load_module(FINOPS_EXPERT_PATH, "finops_expert")
     if finops_expert:
         logger.info("Successfully loaded main FinOps Expert module")
-        _finops_expert_module = finops_expert
+        _cache_module(finops_expert, FINOPS_EXPERT_PATH)
         return finops_expert
     
     # If main module fails, try the simplified version
@@ -71,7 +112,7 @@ def load_finops_expert():
     finops_expert = _try_load_module(FINOPS_EXPERT_SIMPLIFIED_PATH, "finops_expert_simplified")
     if finops_expert:
         logger.info("Successfully loaded simplified FinOps Expert module")
-        _finops_expert_module = finops_expert
+        _cache_module(finops_expert, FINOPS_EXPERT_SIMPLIFIED_PATH)
         return finops_expert
     
     # If both fail, return None
@@ -89,47 +130,77 @@ def _try_load_module(module_path, module_name):
     """Helper function to try loading a module"""
     try:
         if not os.path.exists(module_path):
-            logger.warning(f"Module not found at: {module_path}")
+            logger.warning("Module not found at: %s", module_path)
             return None
         
-        logger.info(f"Loading module from {module_path}")
+        # Reuse an earlier load of the same, unchanged file (e.g. after this router module is reloaded)
+        mtime = _module_mtime(module_path)
+        module = sys.modules.get(module_name)
+        if (
+            module is not None
+            and getattr(module, "__file__", None) == module_path
+            and getattr(module, "__loaded_mtime__", None) == mtime
+        ):
+            return module
+        
+        logger.info("Loading module from %s", module_path)
         
         # Add the directory containing the module to sys.path
         module_dir = os.path.dirname(module_path)
-        if module_dir not in sys.path:
-            sys.path.append(module_dir)
-            logger.info(f"Added {module_dir} to sys.path")
+        if module_dir not in _SYS_PATH_ADDED:
+            _SYS_PATH_ADDED.add(module_dir)
+            if module_dir not in sys.path:
+                sys.path.append(module_dir)
+                logger.info("Added %s to sys.path", module_dir)
         
-        # Load the module
+        # Load the module - registered in sys.modules first, as a regular import would,
+        # so imports of it by name (including circular ones) get this module instead of executing it again
         spec = importlib.util.spec_from_file_location(module_name, module_path)
         module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        
-        # Log available functions
-        functions = [name for name in dir(module) if callable(getattr(module, name)) and not name.startswith('_')]
-        logger.info(f"Available functions in module: {', '.join(functions)}")
+        module.__loaded_mtime__ = mtime
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(module_name, None)
+            raise
         
         return module
     except Exception as e:
-        logger.error(f"Failed to load module {module_name}: {str(e)}")
-        logger.error(f"Exception details: {traceback.format_exc()}")
+        logger.exception("Failed to load module %s: %s", module_name, e)
         return None
 
+def extract_sources(text, sources, seen_urls):
+    """Append the markdown links in text to sources, skipping URLs already in seen_urls"""
+    for title, url in extract_markdown_links(text):
+        # Skip links already in the sources list (avoid duplicates)
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
+        sources.append({
+            "title": title,
+            "url": url,
+            "description": f"Source for information on {title}"
+        })
+
+def _stream_line(payload):
+    return orjson.dumps(payload) + b"\n"
+
 # Simple test endpoint that doesn't require the external module
 @router.get("/test")
 async def test_api():
-    return {"status": "ok", "message": "FinOps API is working"}
+    return Response(content=TEST_RESPONSE_BODY, media_type="application/json")
 
 # Routes
 @router.post("/expert/ask", response_model=AnswerResponse)
 async def ask_finops_question(question_request: QuestionRequest):
     try:
-        # Load the finops_expert module
-        finops_expert = load_finops_expert()
+        # Load the finops_expert module (the first load runs its Azure setup, so keep it off the event loop)
+        finops_expert = await run_in_threadpool(load_finops_expert)
         
         # If module couldn't be loaded, raise an appropriate error
         if finops_expert is None:
-            logger.error(f"FinOps Expert module not available for question: {question_request.question}")
+            logger.error("FinOps Expert module not available for question: %s", question_request.question)
             raise HTTPException(
                 status_code=500,
                 detail="FinOps Expert module is not available. Please check server logs."
@@ -139,38 +210,74 @@ async def ask_finops_question(question_request: QuestionRequest):
         options = question_request.options if question_request.options else {}
         
         # Call the finops_expert_with_bing function with options
-        logger.info(f"Processing FinOps question: {question_request.question}")
-        answer = finops_expert.finops_expert_with_bing(question_request.question, config=options)
+        logger.info("Processing FinOps question: %s", question_request.question)
+        # The expert call blocks for the whole Bing + LLM round trip, so keep it off the event loop
+        answer = await run_in_threadpool(finops_expert.finops_expert_with_bing, question_request.question, config=options)
         
         # Extract sources if available in the answer text
         sources = []
-        # Simple extraction of markdown links as sources
-        import re
-        markdown_links = re.findall(r'\[(.*?)\]\((https?://[^\s)]+)\)', answer)
-        for title, url in markdown_links:
-            # Check if this is already in the sources list (avoid duplicates)
-            if not any(s.get("url") == url for s in sources):
-                sources.append({
-                    "title": title,
-                    "url": url,
-                    "description": f"Source for information on {title}"
-                })
+        extract_sources(answer, sources, set())
         
-        logger.info(f"Extracted {len(sources)} sources from response")
+        logger.info("Extracted %d sources from response", len(sources))
         return AnswerResponse(answer=answer, sources=sources)
     except Exception as e:
-        logger.error(f"Error processing FinOps question: {str(e)}")
-        logger.error(f"Exception traceback: {traceback.format_exc()}")
+        logger.exception("Error processing FinOps question: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Error processing your question: {str(e)}"
         )
 
+@router.post("/expert/ask/stream")
+async def ask_finops_question_stream(question_request: QuestionRequest):
+    """Stream the Bing-grounded answer as newline-delimited JSON while the agent generates it: a status line
+    right away, each piece of the reply as it arrives ({"type": "chunk"}), then its sources ({"type": "sources"})
+
+    The streamed answer is not enhanced or quality checked - use /expert/ask for the full pipeline"""
+    async def answer_lines():
+        yield _stream_line({"type": "status", "content": "Processing your question. Please wait..."})
+        try:
+            finops_expert = await run_in_threadpool(load_finops_expert)
+            if finops_expert is None:
+                logger.error("FinOps Expert module not available for question: %s", question_request.question)
+                yield _stream_line({"type": "error", "content": "FinOps Expert module is not available. Please check server logs."})
+                return
+            if not hasattr(finops_expert, "stream_finops_expert_with_bing"):
+                logger.error("Loaded FinOps Expert module does not support streaming")
+                yield _stream_line({"type": "error", "content": "Streaming is not supported by the loaded FinOps Expert module."})
+                return
+            
+            logger.info("Processing streamed FinOps question: %s", question_request.question)
+            # The agent stream is read with blocking calls, so each event is pulled in the threadpool
+            answer_parts = []
+            sources = []
+            seen_urls = set()
+            async for event_type, data in iterate_in_threadpool(finops_expert.stream_finops_expert_with_bing(question_request.question)):
+                if event_type == "chunk":
+                    answer_parts.append(data)
+                    yield _stream_line({"type": "chunk", "content": data})
+                elif event_type == "citation" and data["url"] not in seen_urls:
+                    seen_urls.add(data["url"])
+                    sources.append({
+                        "title": data["title"],
+                        "url": data["url"],
+                        "description": f"Source for information on {data['title']}"
+                    })
+            
+            # Links can be split across chunks, so the answer text is scanned once it is complete
+            extract_sources("".join(answer_parts), sources, seen_urls)
+            logger.info("Extracted %d sources from streamed response", len(sources))
+            yield _stream_line({"type": "sources", "sources": sources})
+        except Exception as e:
+            logger.exception("Error streaming FinOps answer: %s", e)
+            yield _stream_line({"type": "error", "content": f"Error processing your question: {str(e)}"})
+    
+    return StreamingResponse(answer_lines(), media_type="application/x-ndjson")
+
 @router.post("/expert/test-bing")
 async def test_bing_connection():
     try:
-        # Load the finops_expert module
-        finops_expert = load_finops_expert()
+        # Load the finops_expert module (the first load runs its Azure setup, so keep it off the event loop)
+        finops_expert = await run_in_threadpool(load_finops_expert)
         
         # If module couldn't be loaded, raise an error
         if finops_expert is None:
@@ -183,7 +290,7 @@ async def test_bing_connection():
         # Call the test_bing_connection function
         logger.info("Testing Bing connection")
         try:
-            result = finops_expert.test_bing_connection()
+            result = await run_in_threadpool(finops_expert.test_bing_connection)
             
             if result:
                 return {"success": True, "message": "Bing connection test successful"}
@@ -193,7 +300,7 @@ async def test_bing_connection():
             # If test_bing_connection is not available, try test_bing_sample
             logger.info("test_bing_connection not found, trying test_bing_sample")
             try:
-                result = finops_expert.test_bing_sample()
+                result = await run_in_threadpool(finops_expert.test_bing_sample)
                 if result:
                     return {"success": True, "message": "Bing connection test successful (using sample)"}
                 else:
@@ -207,8 +314,7 @@ async def test_bing_connection():
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error testing Bing connection: {str(e)}")
-        logger.error(f"Exception traceback: {traceback.format_exc()}")
+        logger.exception("Error testing Bing connection: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Error testing Bing connection: {str(e)}"
@@ -219,8 +325,8 @@ async def test_bing_connection():
 async def configure_finops_expert(config: Dict[str, Any] = Body(default={})):
     """Update configuration for the FinOps Expert module"""
     try:
-        # Load the finops_expert module
-        finops_expert = load_finops_expert()
+        # Load the finops_expert module (the first load runs its Azure setup, so keep it off the event loop)
+        finops_expert = await run_in_threadpool(load_finops_expert)
         
         if finops_expert is None:
             logger.error("FinOps Expert module not available for configuration")
@@ -229,9 +335,8 @@ async def configure_finops_expert(config: Dict[str, Any] = Body(default={})):
                 detail="FinOps Expert module is not available. Please check server logs."
             )
         
-        # Log available functions to help with debugging
-        functions = [name for name in dir(finops_expert) if callable(getattr(finops_expert, name)) and not name.startswith('_')]
-        logger.info(f"Available functions in module: {', '.join(functions)}")
+        # Available functions are listed once when the module is loaded
+        functions = list(get_finops_expert_functions())
         
         # We don't actually update any module-level configuration
         # This is just to check if the module loaded correctly
@@ -244,8 +349,7 @@ async def configure_finops_expert(config: Dict[str, Any] = Body(default={})):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error configuring FinOps Expert: {str(e)}")
-        logger.error(f"Exception traceback: {traceback.format_exc()}")
+        logger.exception("Error configuring FinOps Expert: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Error configuring FinOps Expert: {str(e)}"
@@ -255,11 +359,12 @@ async def configure_finops_expert(config: Dict[str, Any] = Body(default={})):
 @router.get("/expert/health")
 async def health_check():
     """Check if the FinOps Expert module is available"""
-    finops_expert = load_finops_expert()
+    # The first load runs the module's Azure setup, so keep it off the event loop
+    finops_expert = await run_in_threadpool(load_finops_expert)
     
     if finops_expert:
         # Get available functions
-        functions = [name for name in dir(finops_expert) if callable(getattr(finops_expert, name)) and not name.startswith('_')]
+        functions = get_finops_expert_functions()
         
         return {
             "status": "ok",
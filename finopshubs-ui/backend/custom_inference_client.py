@@ -8,13 +8,15 @@ class InferenceClient:
         self.endpoint = endpoint
         self.api_key = api_key
         self.credential = AzureKeyCredential(api_key)
+        # One session per client so repeated completions reuse the same keep-alive TLS connection
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "api-key": api_key
+        })
     
     def get_chat_completions(self, deployment_name, messages, max_tokens=None, temperature=None):
         url = f"{self.endpoint}/deployments/{deployment_name}/chat/completions?api-version=2023-05-15"
-        headers = {
-            "Content-Type": "application/json",
-            "api-key": self.api_key
-        }
         
         body = {
             "messages": messages
@@ -26,7 +28,7 @@ class InferenceClient:
         if temperature is not None:
             body["temperature"] = temperature
         
-        response = requests.post(url, headers=headers, json=body)
+        response = self.session.post(url, json=body)
         response.raise_for_status()
         
         # Create a response object that mimics the Azure SDK's response
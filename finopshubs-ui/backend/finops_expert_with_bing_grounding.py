@@ -9,9 +9,8 @@ import time
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
 from azure.ai.projects import AIProjectClient
-from azure.ai.projects.models import MessageRole, BingGroundingTool
+from azure.ai.projects.models import MessageRole, BingGroundingTool, MessageDeltaChunk, ThreadMessage, ThreadRun, AgentStreamEvent
 from azure.ai.inference import ChatCompletionsClient
 from azure.ai.inference.models import SystemMessage, UserMessage
 from azure.core.credentials import AzureKeyCredential
@@ -20,6 +19,13 @@ import urllib.parse
 import traceback
 import signal
 
+# The credential setup and text helpers are shared with the FinOps scripts in finopshubs-ai, next to finopshubs-ui in the repository
+FINOPS_AI_DIR = str(Path(__file__).resolve().parents[2] / "finopshubs-ai")
+if FINOPS_AI_DIR not in sys.path:
+    sys.path.append(FINOPS_AI_DIR)
+from finops_client import create_credential
+from finops_text import REFERENCE_URL_LABELS, parse_evaluation
+
 # Load environment variables - simplified approach to find .env file
 # Start by checking current directory, then parent directories
 def find_dotenv():
@@ -117,10 +123,10 @@ bing_connection = None
 deepseek_client = None
 
 try:
-    # Initialize the DefaultAzureCredential
-    print("\nInitializing DefaultAzureCredential...")
-    credential = DefaultAzureCredential()
-    print("✅ DefaultAzureCredential initialized")
+    # Initialize the Azure credential
+    print("\nInitializing Azure credential...")
+    credential = create_credential()
+    print(f"✅ {type(credential).__name__} initialized")
     
     # Initialize AIProjectClient for Bing grounding
     print("\nInitializing AIProjectClient...")
@@ -322,6 +328,59 @@ def ask_finops_question_with_bing(agent, question):
             "bing_urls": []
         }
 
+# Streaming variant for the /expert/ask/stream route
+def stream_finops_expert_with_bing(question):
+    """
+    Stream the Bing-grounded answer to a FinOps question while the agent generates it
+    
+    Yields ("chunk", text) for each piece of the reply as it arrives, then ("citation", {"title", "url"})
+    for each URL citation on the finished message. The answer is not enhanced or evaluated - those
+    steps need the complete text, so use finops_expert_with_bing for them.
+    """
+    finops_agent = create_finops_bing_agent()
+    if not finops_agent:
+        raise RuntimeError("Could not create FinOps agent with Bing grounding. Please check your environment variables and Bing connection.")
+    
+    try:
+        print(f"🔍 Streaming question with Bing grounding: {question}")
+        thread = project_client.agents.create_thread()
+        project_client.agents.create_message(thread_id=thread.id, role=MessageRole.USER, content=question)
+        
+        response_message = None
+        with project_client.agents.create_stream(
+            thread_id=thread.id,
+            agent_id=finops_agent.id,
+            headers={"x-ms-enable-preview": "true"}  # Ensure preview features are enabled
+        ) as stream:
+            for event_type, event_data, _ in stream:
+                if isinstance(event_data, MessageDeltaChunk):
+                    if event_data.text:
+                        yield "chunk", event_data.text
+                elif isinstance(event_data, ThreadMessage):
+                    # The completed agent message carries the URL citation annotations
+                    if event_data.role == MessageRole.AGENT and event_data.status == "completed":
+                        response_message = event_data
+                elif isinstance(event_data, ThreadRun):
+                    if event_data.status == "failed":
+                        raise RuntimeError(f"Run failed: {event_data.last_error}")
+                elif event_type == AgentStreamEvent.ERROR:
+                    raise RuntimeError(f"Stream error: {event_data}")
+        
+        if response_message:
+            # The same URL is often annotated at several spans, so keep only the first occurrence
+            seen_urls = set()
+            for annotation in response_message.url_citation_annotations:
+                if annotation.url_citation.url not in seen_urls:
+                    seen_urls.add(annotation.url_citation.url)
+                    yield "citation", {"title": annotation.url_citation.title, "url": annotation.url_citation.url}
+    finally:
+        # Also runs when the client disconnects and the generator is closed early
+        try:
+            project_client.agents.delete_agent(finops_agent.id)
+            print(f"🗑️ Deleted agent: {finops_agent.id}")
+        except Exception as cleanup_error:
+            print(f"⚠️ Note: Could not delete agent: {str(cleanup_error)}")
+
 # Function to enhance answers with DeepSeek-R1
 # Modify the enhancement instructions to focus on actionable insights
 finops_system_prompt = """
@@ -494,97 +553,14 @@ def evaluate_answer_quality(question, answer, deepseek_client=None):
         evaluation_text = response.choices[0].message.content
         
         # Parse the evaluation text to extract structured information
-        # This is a simple parsing implementation - could be more robust
-        overall_score = None
-        strengths = []
-        weaknesses = []
-        improvement_suggestions = []
-        evaluation_summary = ""
-        
-        # Simple parsing based on section headers
-        sections = {
-            "Overall Score": [],
-            "Strengths": [],
-            "Weaknesses": [],
-            "Improvement Suggestions": [],
-            "Evaluation Summary": []
-        }
-        
-        current_section = None
-        for line in evaluation_text.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Check if this line is a section header
-            for section_name in sections.keys():
-                if section_name in line or line.lower().startswith(section_name.lower()):
-                    current_section = section_name
-                    break
-            
-            # Add content to current section
-            if current_section and not line.startswith(current_section):
-                sections[current_section].append(line)
-        
-        # Extract overall score
-        for line in sections["Overall Score"]:
-            # Try to find a number between 1-10
-            import re
-            score_matches = re.findall(r'\b([1-9]|10)\b', line)
-            if score_matches:
-                overall_score = int(score_matches[0])
-                break
-        
-        # Extract lists items, typically starting with "- " or "1. "
-        for line in sections["Strengths"]:
-            if line.startswith(('-', '•', '*', '1.', '2.', '3.')):
-                strengths.append(line.lstrip('- •*123. '))
-        
-        for line in sections["Weaknesses"]:
-            if line.startswith(('-', '•', '*', '1.', '2.', '3.', '4.')):
-                weaknesses.append(line.lstrip('- •*1234. '))
-        
-        for line in sections["Improvement Suggestions"]:
-            if line.startswith(('-', '•', '*', '1.', '2.', '3.')):
-                improvement_suggestions.append(line.lstrip('- •*123. '))
-        
-        # Join the evaluation summary lines
-        evaluation_summary = ' '.join(sections["Evaluation Summary"])
-        
-        # If no overall score was found, estimate one based on the evaluation
-        if overall_score is None:
-            # Count positive vs negative terms as a fallback
-            positive_terms = ['excellent', 'good', 'thorough', 'comprehensive', 'accurate', 'clear', 'improved', 'better']
-            negative_terms = ['poor', 'inadequate', 'missing', 'error', 'incorrect', 'unclear', 'lacks', 'issue']
-            
-            positive_count = sum(1 for term in positive_terms if term in evaluation_text.lower())
-            negative_count = sum(1 for term in negative_terms if term in evaluation_text.lower())
-            
-            # Ensure a minimum score of 2 unless it's completely negative
-            if positive_count > negative_count * 2:
-                overall_score = min(8, 4 + positive_count - negative_count)  # Mostly positive
-            elif positive_count > negative_count:
-                overall_score = min(6, 3 + positive_count - negative_count)  # More positive than negative
-            elif negative_count > positive_count * 2:
-                overall_score = max(2, 4 - (negative_count - positive_count))  # Mostly negative
-            else:
-                overall_score = max(2, 5 - (negative_count - positive_count))  # Mixed
+        evaluation_results = parse_evaluation(evaluation_text)
         
         # Ensure score is at least 2 for any answer with some correct information
-        if overall_score == 1 and len(answer) > 500:  # Substantial answers
-            overall_score = 2
-        
-        # Prepare evaluation results
-        evaluation_results = {
-            "overall_score": overall_score,
-            "strengths": strengths,
-            "weaknesses": weaknesses,
-            "improvement_suggestions": improvement_suggestions,
-            "evaluation_summary": evaluation_summary,
-            "raw_evaluation": evaluation_text
-        }
+        if evaluation_results["overall_score"] == 1 and len(answer) > 500:  # Substantial answers
+            evaluation_results["overall_score"] = 2
+        evaluation_results["raw_evaluation"] = evaluation_text
         
-        print(f"✅ Evaluation completed with score: {overall_score}/10")
+        print(f"✅ Evaluation completed with score: {evaluation_results['overall_score']}/10")
         return evaluation_results
         
     except Exception as e:
@@ -869,15 +845,12 @@ def finops_expert_with_bing(question, config=None):
                     cleaned_urls.append(cleaned_url)
             
             if cleaned_urls:
-                enhanced_answer += "\n\n## References\n"
+                references = ["\n\n## References"]
                 for i, url in enumerate(cleaned_urls, 1):
                     # Determine what kind of URL it is for better labeling
-                    if "github.com/microsoft/finops-toolkit" in url:
-                        enhanced_answer += f"{i}. [FinOps Toolkit GitHub Resource]({url})\n"
-                    elif "learn.microsoft.com" in url or "docs.microsoft.com" in url:
-                        enhanced_answer += f"{i}. [Microsoft Documentation]({url})\n"
-                    else:
-                        enhanced_answer += f"{i}. [Reference]({url})\n"
+                    label = next((label for needle, label in REFERENCE_URL_LABELS if needle in url), "Reference")
+                    references.append(f"{i}. [{label}]({url})")
+                enhanced_answer += "\n".join(references) + "\n"
                 
         # Force GitHub repository knowledge if configured
         if force_github_knowledge and not "github.com/microsoft/finops-toolkit" in enhanced_answer:
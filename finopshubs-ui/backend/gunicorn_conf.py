@@ -0,0 +1,22 @@
+"""
+Gunicorn settings for running the FinOps Hubs UI API in production
+
+    gunicorn app.main:app -c gunicorn_conf.py
+
+Each worker is a separate uvicorn process that loads its own copy of the FinOps Expert module
+at startup, so every worker does its own Azure credential, project client and Bing setup and
+keeps its own caches and agents. Gunicorn does not run on Windows - use `python -m app.main` there.
+"""
+import os
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+
+# Requests mostly wait on Bing and DeepSeek rather than the CPU, and each worker repeats the expert setup,
+# so the usual 2 x cores + 1 is capped at 4. WEB_CONCURRENCY overrides it
+workers = int(os.getenv("WEB_CONCURRENCY", min((os.cpu_count() or 1) * 2 + 1, 4)))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Expert answers (Bing search plus DeepSeek enhancement) can take well over a minute
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
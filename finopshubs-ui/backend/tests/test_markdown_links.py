@@ -0,0 +1,51 @@
+"""Tests for app.markdown_links - run from the backend directory with: python -m unittest discover tests"""
+
+import random
+import re
+import unittest
+
+from app.markdown_links import extract_markdown_links
+
+# The pattern the scanner replaces - its results are the reference
+MARKDOWN_LINK_RE = re.compile(r'\[(.*?)\]\((https?://[^\s)]+)\)')
+
+
+class ExtractMarkdownLinksTests(unittest.TestCase):
+
+    def test_simple_links(self):
+        text = "See [Docs](https://learn.microsoft.com/a) and [Repo](http://github.com/b)."
+        self.assertEqual(
+            extract_markdown_links(text),
+            [("Docs", "https://learn.microsoft.com/a"), ("Repo", "http://github.com/b")]
+        )
+
+    def test_nested_brackets_keep_the_outer_title(self):
+        self.assertEqual(extract_markdown_links("[[x]](http://a.com)"), [("[x]", "http://a.com")])
+        self.assertEqual(extract_markdown_links("[a [b] c](https://a.com)"), [("a [b] c", "https://a.com")])
+
+    def test_stray_bracket_before_link_starts_the_title(self):
+        self.assertEqual(extract_markdown_links("[note] see [doc](https://a.com)"), [("note] see [doc", "https://a.com")])
+
+    def test_title_does_not_span_lines(self):
+        self.assertEqual(extract_markdown_links("[first\nsecond](https://a.com)"), [])
+        self.assertEqual(extract_markdown_links("[open\n[second](https://a.com)"), [("second", "https://a.com")])
+
+    def test_invalid_urls_are_skipped(self):
+        self.assertEqual(extract_markdown_links("[a](ftp://a.com) [b](https://) [c](https://a b) [d](https://a.com"), [])
+
+    def test_later_close_bracket_can_complete_the_link(self):
+        self.assertEqual(
+            extract_markdown_links("[a](not-a-url) [b](https://b.com)"),
+            [("a](not-a-url) [b", "https://b.com")]
+        )
+
+    def test_matches_the_regex_on_random_text(self):
+        rng = random.Random(0)
+        alphabet = ["[", "]", "(", ")", "](", "https://", "http://", "a", "b.c", " ", "\n", "/"]
+        for _ in range(20000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(extract_markdown_links(text), MARKDOWN_LINK_RE.findall(text), repr(text))
+
+
+if __name__ == "__main__":
+    unittest.main()